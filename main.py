@@ -5,9 +5,50 @@ from astrbot.api import logger, AstrBotConfig
 import asyncio
 import aiohttp
 import json
+import logging
+import socket
 import struct
+import time
 import traceback
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads  # json.loads 同样可直接解析bytes
+
+# 常用VarInt编码（协议版本-1表示状态查询，1表示status状态）
+_VARINT_1 = b"\x01"
+_VARINT_NEG1 = b"\xff\xff\xff\xff\x0f"
+
+# 预编译的端口打包器，省去每次解析格式串
+_PORT_PACK = struct.Struct(">H").pack
+
+# 预构造的超时对象，各请求复用而不是每次新建
+_HITO_TIMEOUT = aiohttp.ClientTimeout(total=2)
+_API_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+# 状态 -> 表情，未知状态一律红灯
+_STATUS_EMOJI = {"online": "🟢", "starting": "🟡"}
+
+# 状态API可能放玩家列表的字段，按常见程度排序
+_POSSIBLE_PLAYER_FIELDS = ('sample', 'list', 'players', 'player_sample', 'online_players')
+
+def _strip_favicon(raw):
+    """剪掉状态响应中用不到的favicon字段（base64 PNG，往往占载荷大头）"""
+    i = raw.find(b'"favicon":"')
+    if i == -1:
+        return raw
+    j = raw.find(b'"', i + 11)  # base64 data URI中不会出现引号
+    if j == -1:
+        return raw
+    end = j + 1
+    if raw[end:end + 1] == b',':
+        end += 1
+    elif i > 0 and raw[i - 1:i] == b',':
+        i -= 1
+    return raw[:i] + raw[end:]
+
 @register("minecraft_monitor", "YourName", "Minecraft服务器监控插件", "2.0.0")
 class MyPlugin(Star):
     def __init__(self, context: Context, config: AstrBotConfig = None):
@@ -18,24 +59,86 @@ class MyPlugin(Star):
         # 配置处理
         self.target_group = self.config.get("target_group")
         if self.target_group and not str(self.target_group).isdigit():
-            logger.error(f"target_group '{self.target_group}' 不是有效数字")
+            logger.error("target_group '%s' 不是有效数字", self.target_group)
             self.target_group = None
+        self._group_id = int(self.target_group) if self.target_group else 0
 
         self.server_name = self.config.get("server_name", "Minecraft服务器")
         self.server_ip = self.config.get("server_ip")
         self.server_port = self.config.get("server_port")
+        self._port_int = int(self.server_port) if self.server_port else 0
+        self.server_type = str(self.config.get("server_type", "je")).lower()
+        self._is_bedrock = (self.server_type == "be")
+        self._server_type_display = "基岩版" if self._is_bedrock else "Java版"
         self.check_interval = int(self.config.get("check_interval", 10))
         self.enable_auto_monitor = self.config.get("enable_auto_monitor", False)
-        
-        # 缓存数据
-        self.last_player_count = None
-        self.last_player_list = []
+
+        # 监控的服务器列表：主服务器 + servers 配置里的额外条目（名称|IP|端口）
+        self.servers = []
+        if self.server_ip and self.server_port:
+            self.servers.append({'name': self.server_name, 'ip': self.server_ip, 'port': int(self.server_port)})
+        for entry in self.config.get("servers") or []:
+            parts = str(entry).split("|")
+            if len(parts) == 3 and parts[2].strip().isdigit():
+                self.servers.append({'name': parts[0].strip() or parts[1].strip(),
+                                     'ip': parts[1].strip(), 'port': int(parts[2])})
+            else:
+                logger.error("servers 配置格式错误(应为 名称|IP|端口): %s", entry)
+
+        # 各服务器的监控状态缓存：{(ip, port): {'count': 人数, 'players': frozenset}}
+        self._states = {}
+
+        # 查询结果短TTL缓存：{(ip, port): (时间, 数据)}，监控与/查询互相复用
+        self._data_cache = {}
+
+        # 基岩版状态API的URL缓存：{(ip, port): url}，免去每次轮询的f-string拼接
+        self._status_urls = {}
+
+        # 通知合并：2秒窗口内累计的变动合并成一条群消息
+        self._pending_changes = []
+        self._flush_handle = None
+
+        # 自适应轮询：连续无变化时逐步拉长间隔，有变化立即恢复
+        self._stable_streak = 0
+        self._current_interval = self.check_interval
+
+        # 离线/不可达时的指数退避计数
+        self._fail_streak = 0
+
+        # 共享HTTP会话（懒加载，terminate时关闭）
+        self._http_session = None
+
+        # AIOCQHTTP客户端缓存，发送失败时置空以便下次重新解析
+        self._cached_client = None
+
+        # 一言TTL缓存：(获取时间, 内容)，短时间内的重复通知复用同一句
+        self._hito_cache = (0.0, None)
+        self._hito_ttl = 30
+
+        # 一言熔断：连续失败后暂停请求一段时间，通知不被死接口拖慢
+        self._hito_fail = 0
+        self._hito_open_until = 0.0
+
+        # 消息格式化缓存：状态未变时直接复用上次拼好的字符串
+        self._fmt_cache = {}
+
+        # 玩家列表字符串缓存：玩家未变时免去切片+join
+        self._last_players_key = None
+        self._last_players_str = ""
+
+        # DNS缓存：{主机名: (IP, 解析时间)}，避免每次轮询都getaddrinfo
+        self._dns_cache = {}
+
+        # 预组装Ping数据包：{(ip, port): packet}，逐次轮询无需重复编码
+        self._ping_packets = {}
+        for s in self.servers:
+            self._ping_packets[(s['ip'], s['port'])] = self._build_ping_packet(s['ip'], s['port'])
         
         if not self.target_group or not self.server_ip or not self.server_port:
             logger.error("配置不完整(target_group/ip/port)，监控无法启动")
             self.enable_auto_monitor = False
         else:
-            logger.info(f"MC监控已加载 | 服务器: {self.server_ip}:{self.server_port}")
+            logger.info("MC监控已加载 | 服务器: %s:%s", self.server_ip, self.server_port)
         
         if self.enable_auto_monitor:
             asyncio.create_task(self._delayed_auto_start())
@@ -46,204 +149,404 @@ class MyPlugin(Star):
             self.task = asyncio.create_task(self.monitor_task())
             logger.info("🚀 自动启动服务器监控任务")
 
+    async def _get_http(self):
+        """获取共享的HTTP会话（懒加载，连接保持keep-alive、DNS缓存）"""
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                timeout=_HITO_TIMEOUT,
+                connector=aiohttp.TCPConnector(limit=4, ttl_dns_cache=300, keepalive_timeout=60)
+            )
+        return self._http_session
+
     async def get_hitokoto(self):
-        """获取一言"""
+        """获取一言（带TTL缓存，避免每次通知都请求一次）"""
+        now = time.monotonic()
+        ts, val = self._hito_cache
+        if val and now - ts < self._hito_ttl:
+            return val
+        if now < self._hito_open_until:
+            # 熔断中，直接放弃本次点缀
+            return None
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get("https://v1.hitokoto.cn/?encode=text", timeout=aiohttp.ClientTimeout(total=2)) as resp:
-                    return await resp.text() if resp.status == 200 else None
-        except Exception as e:
-            logger.debug(f"获取一言失败: {e}")
+            session = await self._get_http()
+            async with session.get("https://v1.hitokoto.cn/?encode=text") as resp:
+                if resp.status != 200:
+                    return None
+                text = await resp.text()
+                self._hito_cache = (now, text)
+                self._hito_fail = 0
+                return text
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+            logger.debug("获取一言失败: %s", e)
+            self._hito_fail += 1
+            if self._hito_fail >= 3:
+                self._hito_open_until = time.monotonic() + 60
             return None
 
     def _parse_players(self, players_data):
         """解析玩家列表，返回名字列表"""
-        if not players_data:
-            return []
-        
         # 标准格式：列表包含字典 [{"name": "player1"}, ...]
-        if isinstance(players_data, list):
-            return [p.get("name", str(p)) if isinstance(p, dict) else str(p) for p in players_data]
-        
-        return []
+        if not players_data or not isinstance(players_data, list):
+            return []
+
+        out = []
+        append = out.append
+        for p in players_data:
+            if type(p) is dict:
+                n = p.get("name")
+                append(n if n is not None else str(p))
+            else:
+                append(str(p))
+        return out
+
+    def _build_ping_packet(self, host, port):
+        """预组装完整的握手+状态请求包"""
+        host_bytes = host.encode("utf-8")
+        handshake = b"".join([
+            b"\x00",
+            _VARINT_NEG1,  # Protocol version: -1 for status
+            self._pack_varint(len(host_bytes)),
+            host_bytes,
+            _PORT_PACK(int(port)),
+            _VARINT_1,  # Next state: 1 for status
+        ])
+        # 末尾的 \x01\x00 即状态请求包：长度1 + 包ID 0
+        return b"".join([self._pack_varint(len(handshake)), handshake, b"\x01\x00"])
+
+    def _extract_motd(self, desc):
+        """统一解析各种形态的MOTD/description字段"""
+        t = type(desc)
+        if t is str:
+            return desc
+        if t is dict:
+            return (desc.get("text") or self._flatten_extra(desc)
+                    or " ".join(map(str, desc.get("clean") or ())))
+        return "" if not desc else str(desc)
+
+    def _flatten_extra(self, motd_data):
+        """拼接组件式MOTD的extra[]文本（常见于模组服务端）"""
+        parts = []
+        for comp in motd_data.get("extra") or ():
+            if type(comp) is dict:
+                parts.append(comp.get("text", ""))
+            else:
+                parts.append(str(comp))
+        return "".join(parts)
 
     def _pack_varint(self, val):
         """将整数打包为VarInt格式（Minecraft协议）"""
-        total = b""
         if val < 0:
-            val = (1 << 32) + val
+            val &= 0xFFFFFFFF
+        buf = bytearray()
         while True:
             byte = val & 0x7F
             val >>= 7
-            if val != 0:
+            if val:
                 byte |= 0x80
-            total += bytes([byte])
-            if val == 0:
-                break
-        return total
+            buf.append(byte)
+            if not val:
+                return bytes(buf)
+
+    def _decode_varint(self, buf, offset):
+        """从缓冲区同步解析VarInt，返回(值, 新偏移)；数据不足时返回None"""
+        n = len(buf)
+        # 快速路径：1字节（长度<128，最常见）与2字节（JSON长度的常见范围）
+        if offset < n:
+            b0 = buf[offset]
+            if b0 < 0x80:
+                return b0, offset + 1
+            if offset + 1 < n:
+                b1 = buf[offset + 1]
+                if b1 < 0x80:
+                    return (b0 & 0x7F) | (b1 << 7), offset + 2
 
-    async def _read_varint(self, reader):
-        """从流中读取VarInt格式的整数（Minecraft协议）"""
         val = 0
         shift = 0
-        bytes_read = 0
-        max_bytes = 5  # VarInt最多5字节
-        while True:
-            byte = await reader.read(1)
-            if len(byte) == 0:
-                raise Exception("Connection closed")
-            b = byte[0]
+        for i in range(offset, min(offset + 5, n)):  # VarInt最多5字节
+            b = buf[i]
             val |= (b & 0x7F) << shift
-            bytes_read += 1
-            if bytes_read > max_bytes:
-                raise Exception("VarInt too big")
             if (b & 0x80) == 0:
-                break
+                return val, i + 1
             shift += 7
-        return val
+        if len(buf) - offset >= 5:
+            raise Exception("VarInt too big")
+        return None
+
+    async def _resolve(self, host):
+        """解析主机名并缓存约5分钟，连接失败时由调用方失效缓存"""
+        cached = self._dns_cache.get(host)
+        now = time.monotonic()
+        if cached and now - cached[1] < 300:
+            return cached[0]
+        try:
+            loop = asyncio.get_running_loop()
+            infos = await loop.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+            ip = infos[0][4][0]
+            self._dns_cache[host] = (ip, now)
+            return ip
+        except OSError as e:
+            logger.debug("解析 %s 失败: %s", host, e)
+            return host
 
     async def _ping_server(self, host, port):
         """使用Minecraft Server List Ping协议直接查询服务器"""
+        connect_host = await self._resolve(host)
         try:
             reader, writer = await asyncio.wait_for(
-                asyncio.open_connection(host, port), timeout=10.0
+                asyncio.open_connection(connect_host, port), timeout=10.0
             )
         except asyncio.TimeoutError:
-            logger.warning(f"服务器Ping失败: {host}:{port} - 连接超时(10秒)")
+            logger.warning("服务器Ping失败: %s:%s - 连接超时(10秒)", host, port)
+            self._dns_cache.pop(host, None)
             return None
         except ConnectionRefusedError:
-            logger.warning(f"服务器Ping失败: {host}:{port} - 连接被拒绝(服务器可能未运行)")
+            logger.warning("服务器Ping失败: %s:%s - 连接被拒绝(服务器可能未运行)", host, port)
+            self._dns_cache.pop(host, None)
             return None
         except Exception as e:
-            logger.warning(f"服务器Ping失败: {host}:{port} - {type(e).__name__}: {e}")
+            logger.warning("服务器Ping失败: %s:%s - %s: %s", host, port, type(e).__name__, e)
+            self._dns_cache.pop(host, None)
             return None
 
         try:
-            # 发送握手包
-            host_bytes = host.encode("utf-8")
-            handshake = (
-                b"\x00"
-                + self._pack_varint(-1)  # Protocol version: -1 for status
-                + self._pack_varint(len(host_bytes))
-                + host_bytes
-                + struct.pack(">H", int(port))
-                + self._pack_varint(1)  # Next state: 1 for status
-            )
-            packet = self._pack_varint(len(handshake)) + handshake
-            writer.write(packet)
-
-            # 发送状态请求包
-            request = b"\x00"
-            packet = self._pack_varint(len(request)) + request
+            # 禁用Nagle避免小包合并等待，缩小接收缓冲，linger=0使关闭立即生效
+            sock = writer.get_extra_info('socket')
+            if sock is not None:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 65536)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+
+            # 使用预组装的数据包；未知目标（配置热更新）时现场组装并缓存
+            packet = self._ping_packets.get((host, int(port)))
+            if packet is None:
+                packet = self._ping_packets[(host, int(port))] = self._build_ping_packet(host, port)
             writer.write(packet)
             await writer.drain()
 
-            # 读取响应
+            # 读取响应（大块读入缓冲区，VarInt与JSON都在内存中解析，减少await次数）
             async def read_response():
-                length = await self._read_varint(reader)
-                packet_id = await self._read_varint(reader)
+                buf = bytearray()
+                pos = 0
+                max_size = 131072  # 状态响应上限128KB，防御异常服务端
+
+                async def fill():
+                    chunk = await reader.read(65536)
+                    if not chunk:
+                        raise Exception("Connection closed")
+                    buf.extend(chunk)
+                    if len(buf) > max_size:
+                        raise Exception("Status response too large")
+
+                async def next_varint():
+                    nonlocal pos
+                    while True:
+                        parsed = self._decode_varint(buf, pos)
+                        if parsed is not None:
+                            val, pos = parsed
+                            return val
+                        await fill()
+
+                length = await next_varint()
+                packet_id = await next_varint()
 
                 if packet_id == 0:
-                    json_len = await self._read_varint(reader)
-                    data = await reader.readexactly(json_len)
-                    decoded_data = data.decode("utf-8")
-                    logger.debug(f"MC Server response: {decoded_data}")
-                    return json.loads(decoded_data)
+                    json_len = await next_varint()
+                    while len(buf) - pos < json_len:
+                        await fill()
+                    data = _strip_favicon(bytes(memoryview(buf)[pos:pos + json_len]))
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("MC Server response bytes=%d", len(data))
+                    if len(data) > 16384:
+                        # 大载荷的解析放线程池，不阻塞事件循环里的其他任务
+                        return await asyncio.get_running_loop().run_in_executor(None, _loads, data)
+                    return _loads(data)
                 return None
 
             return await asyncio.wait_for(read_response(), timeout=10.0)
 
         except asyncio.TimeoutError:
-            logger.warning(f"服务器Ping失败: {host}:{port} - 读取响应超时(10秒)")
+            logger.warning("服务器Ping失败: %s:%s - 读取响应超时(10秒)", host, port)
             return None
         except json.JSONDecodeError as e:
-            logger.warning(f"服务器Ping失败: {host}:{port} - JSON解析错误: {e}")
+            logger.warning("服务器Ping失败: %s:%s - JSON解析错误: %s", host, port, e)
             return None
         except Exception as e:
-            logger.warning(f"服务器Ping失败: {host}:{port} - {type(e).__name__}: {e}")
+            logger.warning("服务器Ping失败: %s:%s - %s: %s", host, port, type(e).__name__, e)
             return None
         finally:
-            writer.close()
+            # 状态查询不需要优雅挥手，直接RST释放，省一个RTT
             try:
-                await writer.wait_closed()
-            except (ConnectionError, OSError, asyncio.CancelledError):
+                writer.transport.abort()
+            except Exception:
                 pass
 
     async def _fetch_server_data(self):
-        """获取Minecraft服务器数据（使用直接Socket连接）"""
+        """获取主服务器数据（单服务器场景和指令查询的薄封装）"""
         if not self.server_ip or not self.server_port:
             return None
-        
+        return await self._fetch_one(self.server_ip, self._port_int, self.server_name)
+
+    async def _fetch_many(self):
+        """并发查询全部已配置的服务器，耗时为最慢一台的RTT而非总和"""
+        if not self.servers:
+            return []
+        return await asyncio.gather(
+            *(self._fetch_one(s['ip'], s['port'], s['name']) for s in self.servers),
+            return_exceptions=True
+        )
+
+    async def _fetch_one(self, host, port, name):
+        """获取单台服务器数据；2秒内的重复查询直接复用上次结果"""
+        key = (host, port)
+        cached = self._data_cache.get(key)
+        if cached and time.monotonic() - cached[0] < 2:
+            return cached[1]
+        result = await self._fetch_one_uncached(host, port, name)
+        if result is not None:
+            self._data_cache[key] = (time.monotonic(), result)
+        return result
+
+    async def _fetch_via_api(self, host, port, name):
+        """通过 motd.minebbs.com 状态API查询（仅基岩版，RakNet协议暂未直连实现）"""
+        url = self._status_urls.get((host, port))
+        if url is None:
+            url = self._status_urls[(host, port)] = \
+                f"https://motd.minebbs.com/api/status?ip={host}&port={port}&stype=be"
         try:
-            data = await self._ping_server(self.server_ip, int(self.server_port))
-            logger.debug(f"MC Server raw data: {data}")
-
-            if not data:
-                return {
-                    'status': 'offline',
-                    'name': self.server_name,
-                    'version': '未知',
-                    'online': 0,
-                    'max': 0,
-                    'player_names': [],
-                    'motd': ''
-                }
-            
-            # 检查是否为正常的服务器信息
-            if "version" in data and "players" in data:
-                version = data.get("version", {}).get("name", "未知版本")
-                players_info = data.get("players", {})
-                online_players = players_info.get("online", 0)
-                max_players = players_info.get("max", 0)
-                player_sample = players_info.get("sample", [])
-                
-                # 提取MOTD
-                motd_data = data.get("description", "")
-                if isinstance(motd_data, dict):
-                    motd = motd_data.get("text", "")
-                else:
-                    motd = str(motd_data) if motd_data else ""
-
-                # 提取玩家名
-                player_names = self._parse_players(player_sample)
-
-                return {
-                    'status': 'online',
-                    'name': self.server_name,
-                    'version': version,
-                    'online': online_players,
-                    'max': max_players,
-                    'player_names': player_names,
-                    'motd': motd
-                }
-            
-            # 可能是启动中或其他状态
+            session = await self._get_http()
+            async with session.get(url, timeout=_API_TIMEOUT) as response:
+                if response.status != 200:
+                    logger.warning("状态API请求失败: %s:%s - HTTP %s", host, port, response.status)
+                    return None
+                # 绕过aiohttp内置的stdlib json，装了orjson时直接吃bytes
+                data = _loads(await response.read())
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError, json.JSONDecodeError) as e:
+            logger.warning("状态API请求失败: %s:%s - %s: %s", host, port, type(e).__name__, e)
+            return None
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("API返回数据: %s", data)
+
+        if data.get("status") != "online":
             return {
-                'status': 'starting',
-                'name': self.server_name,
-                'version': '启动中',
+                'status': 'offline',
+                'name': name,
+                'key': (host, port),
+                'version': '未知',
                 'online': 0,
                 'max': 0,
                 'player_names': [],
-                'motd': str(data)
+                'motd': ''
             }
 
+        players_info = data.get("players") or {}
+        online_players = players_info.get("online", 0)
+        max_players = players_info.get("max", 0)
+
+        # 各家API的玩家列表字段不统一，逐个探测；空服直接跳过
+        player_sample = []
+        if online_players:
+            for field in _POSSIBLE_PLAYER_FIELDS:
+                v = players_info.get(field)
+                if v:
+                    player_sample = v
+                    break
+
+        player_names = self._parse_players(player_sample)
+        version = data.get("version", "未知版本")
+        if type(version) is dict:
+            version = version.get("name", "未知版本")
+
+        return {
+            'status': 'online',
+            'name': name,
+            'key': (host, port),
+            'version': version,
+            'online': online_players,
+            'max': max_players,
+            'player_names': player_names,
+            'player_set': frozenset(player_names),
+            'motd': self._extract_motd(data.get("motd") or data.get("description") or "")
+        }
+
+    async def _fetch_one_uncached(self, host, port, name):
+        """获取单台Minecraft服务器数据（使用直接Socket连接）"""
+        if self._is_bedrock:
+            # 基岩版不讲SLP协议，退回HTTP状态API
+            return await self._fetch_via_api(host, port, name)
+
+        # 只保护网络调用本身；后续都是对已验证JSON对象的纯字典访问
+        try:
+            data = await self._ping_server(host, port)
         except Exception as e:
-            logger.error(f"获取服务器信息出错: {e}")
+            logger.error("获取服务器信息出错: %s", e)
             return None
 
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("MC Server raw data: %s", data)
+
+        if not data:
+            return {
+                'status': 'offline',
+                'name': name,
+                'key': (host, port),
+                'version': '未知',
+                'online': 0,
+                'max': 0,
+                'player_names': [],
+                'motd': ''
+            }
+
+        # 检查是否为正常的服务器信息
+        if "version" in data and "players" in data:
+            version = data.get("version", {}).get("name", "未知版本")
+            players_info = data.get("players", {})
+            online_players = players_info.get("online", 0)
+            max_players = players_info.get("max", 0)
+
+            # 提取MOTD
+            motd = self._extract_motd(data.get("description", ""))
+
+            # 提取玩家名（空服直接跳过sample解析）
+            player_names = self._parse_players(players_info.get("sample")) if online_players else []
+
+            return {
+                'status': 'online',
+                'name': name,
+                'key': (host, port),
+                'version': version,
+                'online': online_players,
+                'max': max_players,
+                'player_names': player_names,
+                'player_set': frozenset(player_names),
+                'motd': motd
+            }
+
+        # 可能是启动中或其他状态
+        return {
+            'status': 'starting',
+            'name': name,
+            'key': (host, port),
+            'version': '启动中',
+            'online': 0,
+            'max': 0,
+            'player_names': [],
+            'motd': str(data)
+        }
+
     def _format_msg(self, data):
         if not data:
             return "❌ 无法连接到服务器"
-        
-        # Add status emoji based on server status
-        if data.get('status') == 'online':
-            status_emoji = "🟢"
-        elif data.get('status') == 'starting':
-            status_emoji = "🟡"
-        else:
-            status_emoji = "🔴"
-        msg = [f"{status_emoji} 服务器: {data['name']}"]
+
+        # 状态未变时复用缓存的消息（最多保留8条）
+        key = (data['name'], data['status'], data['online'], data['max'], data.get('version', ''),
+               data.get('motd', ''), tuple(sorted(data.get('player_names', []))))
+        cached = self._fmt_cache.get(key)
+        if cached is not None:
+            return cached
+
+        status_emoji = _STATUS_EMOJI.get(data['status'], "🔴")
+        msg = [f"{status_emoji} 服务器: {data['name']} ({self._server_type_display})"]
         
         if data.get('motd'):
             msg.append(f"📝 MOTD: {data['motd']}")
@@ -254,83 +557,149 @@ class MyPlugin(Star):
         # Only show player list section if there are players online
         if data.get('player_names') and data['online'] > 0:
             names = data['player_names']
-            p_str = ", ".join(names[:10])
-            if len(names) > 10:
-                p_str += f" 等{len(names)}人"
+            p_key = (data['online'], tuple(names[:10]), len(names))
+            if p_key == self._last_players_key:
+                p_str = self._last_players_str
+            else:
+                p_str = ", ".join(names[:10])
+                if len(names) > 10:
+                    p_str += f" 等{len(names)}人"
+                self._last_players_key = p_key
+                self._last_players_str = p_str
             msg.append(f"📋 玩家列表: {p_str}")
-            
-        return "\n".join(msg)
+
+        result = "\n".join(msg)
+        if len(self._fmt_cache) >= 8:
+            self._fmt_cache.pop(next(iter(self._fmt_cache)))
+        self._fmt_cache[key] = result
+        return result
 
     async def monitor_task(self):
-        """定时监控核心逻辑"""
+        """定时监控核心逻辑（逐台服务器独立维护状态缓存）"""
+        pending = asyncio.create_task(self._fetch_many())
         while True:
             try:
-                data = await self._fetch_server_data()
-                
-                if data and data['status'] == 'online':
+                results = await pending
+                pending = None
+                # 计时与处理/下次查询重叠，轮询周期不再被RTT和通知耗时拉长
+                sleep_task = asyncio.create_task(asyncio.sleep(self._current_interval))
+
+                any_change = False
+                any_online = False
+                notify_parts = []
+                for data in results:
+                    if data is None or isinstance(data, BaseException):
+                        # 获取失败时暂不处理，避免断网刷屏，仅日志
+                        logger.debug("获取服务器数据失败: %s", data)
+                        continue
+                    if data['status'] != 'online':
+                        if data['status'] == 'starting':
+                            logger.info("自动查询完成 - %s 状态: 启动中", data['name'])
+                        else:
+                            logger.info("自动查询完成 - %s 状态: %s", data['name'], data['status'])
+                        continue
+
+                    any_online = True
                     curr_online = data['online']
-                    curr_players = set(data['player_names'])
-                    
+                    curr_players = data['player_set']
+                    state = self._states.get(data['key'])
+
                     # 首次运行初始化
-                    if self.last_player_count is None:
-                        self.last_player_count = curr_online
-                        self.last_player_list = curr_players
-                        logger.info(f"监控初始化完成，当前在线: {curr_online}人")
-                    else:
-                        # 检测变化
-                        changes = []
-                        last_players = self.last_player_list
-                        
-                        joined = curr_players - last_players
-                        left = last_players - curr_players
-                        
-                        if joined:
-                            changes.append(f"📈 {', '.join(joined)} 加入了服务器")
-                        if left:
-                            changes.append(f"📉 {', '.join(left)} 离开了服务器")
-                            
-                        # 如果只有数量变化但获取不到具体名单（部分服务端特性）
-                        if not joined and not left and curr_online != self.last_player_count:
-                            diff = curr_online - self.last_player_count
-                            symbol = "📈" if diff > 0 else "📉"
-                            changes.append(f"{symbol} 在线人数变化: {diff:+d} (当前 {curr_online}人)")
-
-                        if changes:
-                            logger.info(f"🔔 检测到变化: {changes}")
-                            # 构建完整消息
-                            notify_msg = "🔔 状态变动:\n" + "\n".join(changes)
-                            notify_msg += f"\n\n{self._format_msg(data)}"
-                            
-                            hito = await self.get_hitokoto()
-                            if hito: notify_msg += f"\n\n💬 {hito}"
-                            
-                            logger.info(f"准备发送变动通知消息，长度: {len(notify_msg)} 字符")
-                            await self.send_group_msg(notify_msg)
-                        
-                        # Log status after each query cycle
-                        logger.info(f"自动查询完成 - 在线: {curr_online}人, 状态: 正常")
-                        
-                        # 更新缓存
-                        self.last_player_count = curr_online
-                        self.last_player_list = curr_players
-                
-                elif data is None:
-                    # 获取失败时暂不处理，避免断网刷屏，仅日志
-                    logger.debug("获取服务器数据失败")
+                    if state is None:
+                        self._states[data['key']] = {'count': curr_online, 'players': curr_players}
+                        logger.info("监控初始化完成 - %s 当前在线: %s人", data['name'], curr_online)
+                        continue
+                    if curr_players == state['players'] and curr_online == state['count']:
+                        # 快速路径：状态无变化，跳过差集计算和缓存更新
+                        logger.info("自动查询完成 - %s 在线: %s人, 状态: 正常", data['name'], curr_online)
+                        continue
+
+                    # 检测变化：一次对称差后再分拣，少走一遍哈希表
+                    changes = []
+                    last_players = state['players']
+
+                    sym = curr_players ^ last_players
+                    joined = sym & curr_players
+                    left = sym & last_players
+
+                    if joined:
+                        changes.append(f"📈 {', '.join(joined)} 加入了服务器")
+                    if left:
+                        changes.append(f"📉 {', '.join(left)} 离开了服务器")
+
+                    # 如果只有数量变化但获取不到具体名单（部分服务端特性）
+                    if not joined and not left and curr_online != state['count']:
+                        diff = curr_online - state['count']
+                        symbol = "📈" if diff > 0 else "📉"
+                        changes.append(f"{symbol} 在线人数变化: {diff:+d} (当前 {curr_online}人)")
+
+                    if changes:
+                        any_change = True
+                        logger.info("🔔 检测到变化 - %s: %s", data['name'], changes)
+                        notify_parts.append("🔔 状态变动:\n" + "\n".join(changes) + f"\n\n{self._format_msg(data)}")
+
+                    # Log status after each query cycle
+                    logger.info("自动查询完成 - %s 在线: %s人, 状态: 正常", data['name'], curr_online)
+
+                    # 更新缓存
+                    state['count'] = curr_online
+                    state['players'] = curr_players
+
+                if notify_parts:
+                    # 先积累，2秒后统一发送；服务器抖动时N条消息合并成1条
+                    self._pending_changes.extend(notify_parts)
+                    if self._flush_handle is None:
+                        loop = asyncio.get_running_loop()
+                        self._flush_handle = loop.call_later(
+                            2, lambda: asyncio.create_task(self._flush_notifications()))
+
+                # 自适应轮询间隔
+                if any_change:
+                    self._stable_streak = 0
+                    self._fail_streak = 0
+                    self._current_interval = self.check_interval
+                elif not any_online:
+                    # 全部离线/不可达：指数退避，断网时不再持续刷连接
+                    self._current_interval = min(self.check_interval * (2 ** self._fail_streak), 300)
+                    self._fail_streak += 1
                 else:
-                    # Handle other server statuses
-                    if data.get('status') == 'starting':
-                        logger.info(f"自动查询完成 - 服务器状态: 启动中")
-                    else:
-                        logger.info(f"自动查询完成 - 服务器状态: {data.get('status', '未知')}")
-                
-                await asyncio.sleep(self.check_interval)
-                
+                    if self._fail_streak:
+                        # 从离线恢复，回到基础节奏
+                        self._fail_streak = 0
+                        self._current_interval = self.check_interval
+                    self._stable_streak += 1
+                    if self._stable_streak >= 3:
+                        self._current_interval = min(self._current_interval * 2, 10 * self.check_interval)
+
+                pending = asyncio.create_task(self._fetch_many())
+                await sleep_task
+
             except asyncio.CancelledError:
+                if pending:
+                    pending.cancel()
                 break
             except Exception as e:
-                logger.error(f"监控循环异常: {e}")
+                logger.error("监控循环异常: %s", e)
                 await asyncio.sleep(5)
+                pending = asyncio.create_task(self._fetch_many())
+
+    async def _flush_notifications(self):
+        """把合并窗口内累计的变动拼成一条消息发出"""
+        self._flush_handle = None
+        parts = self._pending_changes
+        if not parts:
+            return
+        self._pending_changes = []
+
+        # 一言请求与消息拼装并行
+        hito_task = asyncio.create_task(self.get_hitokoto())
+        notify_msg = "\n\n".join(parts)
+
+        hito = await hito_task
+        if hito: notify_msg += f"\n\n💬 {hito}"
+
+        logger.info("准备发送变动通知消息，长度: %s 字符", len(notify_msg))
+        await self.send_group_msg(notify_msg)
 
     async def send_group_msg(self, text):
         """
@@ -341,30 +710,35 @@ class MyPlugin(Star):
             logger.warning("消息发送失败: target_group 未配置")
             return
         try:
-            # 从插件上下文中获取 AIOCQHTTP (OneBot) 平台适配器
-            platform = self.context.get_platform(PlatformAdapterType.AIOCQHTTP)
-            
-            if not platform:
-                logger.error("未找到 AIOCQHTTP 平台适配器，无法发送消息")
-                return
+            client = self._cached_client
+            if client is None:
+                # 从插件上下文中获取 AIOCQHTTP (OneBot) 平台适配器
+                platform = self.context.get_platform(PlatformAdapterType.AIOCQHTTP)
+
+                if not platform:
+                    logger.error("未找到 AIOCQHTTP 平台适配器，无法发送消息")
+                    return
+
+                # 获取底层的 API 客户端
+                client = platform.get_client()
+
+                if not client:
+                    logger.error("无法获取 AIOCQHTTP 客户端，无法发送消息")
+                    return
+                self._cached_client = client
 
-            # 获取底层的 API 客户端
-            client = platform.get_client()
-            
-            if not client:
-                logger.error("无法获取 AIOCQHTTP 客户端，无法发送消息")
-                return
-            
             # 调用标准的 OneBot v11 API: send_group_msg
-            logger.info(f"正在发送消息到群 {self.target_group}")
+            logger.info("正在发送消息到群 %s", self.target_group)
             await client.api.call_action('send_group_msg', **{
-                'group_id': int(self.target_group),
+                'group_id': self._group_id,
                 'message': text
             })
-            logger.info(f"✅ 消息已发送到群 {self.target_group}")
+            logger.info("✅ 消息已发送到群 %s", self.target_group)
         except Exception as e:
-            logger.error(f"❌ 消息发送失败到群 {self.target_group}: {type(e).__name__}: {e}")
-            logger.error(f"详细错误信息:\n{traceback.format_exc()}")
+            # 客户端可能已失效（重连/换号），下次发送重新解析
+            self._cached_client = None
+            logger.error("❌ 消息发送失败到群 %s: %s: %s", self.target_group, type(e).__name__, e)
+            logger.error("详细错误信息:\n%s", traceback.format_exc())
 
     # --- 指令区域 ---
 
@@ -389,32 +763,40 @@ class MyPlugin(Star):
 
     @filter.command("查询")
     async def cmd_query(self, event: AstrMessageEvent):
-        data = await self._fetch_server_data()
+        # 服务器查询与一言请求互不依赖，并行发出
+        data, hito = await asyncio.gather(self._fetch_server_data(), self.get_hitokoto())
         msg = self._format_msg(data)
-        hito = await self.get_hitokoto()
         if hito: msg += f"\n\n💬 {hito}"
         yield event.plain_result(msg)
 
     @filter.command("reset_monitor")
     async def cmd_reset(self, event: AstrMessageEvent):
-        self.last_player_count = None
-        self.last_player_list = []
+        self._states = {}
+        self._stable_streak = 0
+        self._fail_streak = 0
+        self._current_interval = self.check_interval
         yield event.plain_result("🔄 缓存已重置，下次检测将视为首次")
 
     @filter.command("set_group")
     async def cmd_setgroup(self, event: AstrMessageEvent, group_id: str):
         if group_id.isdigit():
             self.target_group = group_id
+            self._group_id = int(group_id)
             yield event.plain_result(f"✅ 目标群已设为: {group_id}")
         else:
             yield event.plain_result("❌ 群号必须为纯数字")
 
     async def terminate(self):
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
         if self.task:
             self.task.cancel()
             try:
                 await self.task
             except asyncio.CancelledError:
                 pass
+        if self._http_session and not self._http_session.closed:
+            await self._http_session.close()
 
 